@@ -1,56 +1,80 @@
 # --- font_server.py (應與上次提供的一致) ---
 from flask import Flask, request, jsonify
 from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache
+import base64
+import numpy as np
 import os
 
 app = Flask(__name__)
 
 FONT_PATH = 'NotoSansTC-Regular.ttf'
 
+@lru_cache(maxsize=16)
+def _get_font(font_size):
+    """
+    載入並快取字型物件：ImageFont.truetype 每次都會重新解析 TTF
+    並重建 FreeType 內部表格，同一個 font_size 只需要做一次。
+    """
+    if os.path.exists(FONT_PATH):
+        return ImageFont.truetype(FONT_PATH, font_size)
+    print(f"警告: 找不到字型檔案 {FONT_PATH}, 使用預設字型 (大小: {font_size})")
+    return ImageFont.load_default()
+
+@lru_cache(maxsize=4096)
+def _rasterize(text, font_size):
+    """
+    光柵化文字，回傳不可變的 (bitmap_bytes, width, height)。
+
+    相同 (text, font_size) 的請求直接命中 lru_cache，
+    不用重跑 PIL 光柵化與逐像素複製（lru_cache 是 C 實作且執行緒安全）。
+    bitmap_bytes 為 1-bpp MONO_HLSB 打包格式（每列補齊到整數 bytes，MSB 在前）。
+    """
+    font = _get_font(font_size)
+
+    dummy_img = Image.new('1', (1, 1))
+    dummy_draw = ImageDraw.Draw(dummy_img)
+    bbox = dummy_draw.textbbox((0, 0), text, font=font)
+
+    width = bbox[2] - bbox[0]
+    height = bbox[3] - bbox[1]
+
+    if not text.strip():
+        estimated_space_width = font_size // 3
+        if width == 0 and len(text) > 0:
+            width = estimated_space_width * len(text)
+        elif width == 0 and len(text) == 0:
+            width = 1
+
+        if height == 0:
+            height = font_size
+
+    image = Image.new('1', (width, height), 0)
+    draw = ImageDraw.Draw(image)
+    draw.text((-bbox[0], -bbox[1]), text, font=font, fill=1)
+
+    # 用 NumPy 一次把整張圖轉成 0/1 陣列，
+    # 取代 width*height 次 Python 層的 image.getpixel() 呼叫
+    arr = np.asarray(image, dtype=np.uint8)
+
+    # 打包成 1-bpp（MSB 在前，逐列補齊）＝ framebuf 的 MONO_HLSB 格式，
+    # 24x24 的字從 ~2-4KB JSON 縮成 72 bytes
+    packed = np.packbits(arr, axis=1).tobytes()
+
+    return packed, width, height
+
 def text_to_bitmap(text, font_size):
     try:
-        if os.path.exists(FONT_PATH):
-            font = ImageFont.truetype(FONT_PATH, font_size)
-        else:
-            font = ImageFont.load_default()
-            print(f"警告: 找不到字型檔案 {FONT_PATH}, 使用預設字型 (大小: {font_size})")
-        
-        dummy_img = Image.new('1', (1, 1))
-        dummy_draw = ImageDraw.Draw(dummy_img)
-        bbox = dummy_draw.textbbox((0, 0), text, font=font)
-        
-        width = bbox[2] - bbox[0]
-        height = bbox[3] - bbox[1]
-
-        if not text.strip(): 
-            estimated_space_width = font_size // 3
-            if width == 0 and len(text) > 0:
-                width = estimated_space_width * len(text)
-            elif width == 0 and len(text) == 0:
-                width = 1 
-            
-            if height == 0:
-                height = font_size 
-
-        image = Image.new('1', (width, height), 0)
-        draw = ImageDraw.Draw(image)
-        draw.text((-bbox[0], -bbox[1]), text, font=font, fill=1)
-        
-        bitmap = []
-        for y in range(height):
-            row = []
-            for x in range(width):
-                pixel = image.getpixel((x, y))
-                row.append(1 if pixel else 0)
-            bitmap.append(row)
-        
+        packed, width, height = _rasterize(text, font_size)
+
         return {
-            'bitmap': bitmap,
+            'bitmap_b64': base64.b64encode(packed).decode('ascii'),
             'width': width,
             'height': height,
+            'format': 'MONO_HLSB',
             'success': True
         }
-    
+
     except Exception as e:
         print(f"轉換錯誤: {e}")
         return {
@@ -83,9 +107,25 @@ def get_font_bitmap():
         }), 400
     
     print(f"接收到請求: '{text}' (原始字串), 字體大小: {font_size}")
-    
+
+    # per_char=1: 逐字渲染並一次回傳所有字元的點陣圖，
+    # 讓 ESP32 一次請求就能填滿整個字元快取（批次模式）
+    if request.args.get('per_char') == '1':
+        char_bitmaps = []
+        for char in text:
+            char_data = text_to_bitmap(char, font_size)
+            if not char_data['success']:
+                return jsonify(char_data), 500
+            char_data['char'] = char
+            char_bitmaps.append(char_data)
+        print(f"成功批次轉換: '{text}' ({len(char_bitmaps)} 個字元)")
+        return jsonify({
+            'chars': char_bitmaps,
+            'success': True
+        })
+
     bitmap_data = text_to_bitmap(text, font_size)
-    
+
     if bitmap_data['success']:
         print(f"成功轉換: '{text}' ({bitmap_data['width']}x{bitmap_data['height']})")
         return jsonify(bitmap_data)
@@ -1,5 +1,6 @@
 # main.py
 from oled_display_size import OledChineseDisplay # 確保這裡導入的是 oled_display
+import uasyncio
 import time
 
 # 請確保這是您的 Flask 伺服器實際的 IP 位址
@@ -11,6 +12,26 @@ WIFI_PASSWORD = "04230524"
 
 oled_display = None # 先初始化為 None，以便在 finally 塊中檢查
 
+async def connect_with_animation(display):
+    """非阻塞地連線 Wi-Fi，等待期間同時在螢幕上跑連線動畫。"""
+    result = {}
+
+    async def _connect():
+        result['ok'] = await display.connect_wifi_async(WIFI_SSID, WIFI_PASSWORD)
+
+    async def _animate():
+        dots = 0
+        while 'ok' not in result:
+            # 在第三行畫跳動的點，證明等待 Wi-Fi 時 UI 沒有被卡住
+            display.oled.fill_rect(0, 24, display.width, 8, 0)
+            display.oled.text("." * (dots + 1), 0, 24)
+            display.oled.show()
+            dots = (dots + 1) % 3
+            await uasyncio.sleep(0.4)
+
+    await uasyncio.gather(_connect(), _animate())
+    return result.get('ok', False)
+
 try:
     # 初始化顯示器
     oled_display = OledChineseDisplay(
@@ -21,12 +42,16 @@ try:
         default_font_size=24 # 設定一個預設的「標準」字體大小
     )
 
-    # 連接 Wi-Fi
-    wifi_connected = oled_display.connect_wifi(WIFI_SSID, WIFI_PASSWORD)
+    # 連接 Wi-Fi（非阻塞版本，連線中同時顯示動畫）
+    wifi_connected = uasyncio.run(connect_with_animation(oled_display))
 
     if wifi_connected:
+        # 先把待會要顯示的字元預熱進快取（一次批次請求），
+        # 第一次 display() 就不用再等網路
+        oled_display.prewarm("這是預設大小的字！")
+
         print("\n--- 開始顯示不同大小的文字範例 ---")
-        
+
         # 顯示預設大小的文字 (font_size=24)
         oled_display.display(["這是預設大小的字！"], delay_between_texts=2) 
         
@@ -38,7 +63,7 @@ finally:
     # 確保無論程式如何結束，都嘗試釋放資源
     if oled_display: # 只有當 oled_display 實例化成功後才調用 deinit
         print("\n--- 程式結束，正在釋放資源 ---")
-        oled_display.clear()
+        oled_display.deinit() # 關閉持久連線並清除螢幕
     print("所有操作完成。")
     # 可以選擇在這裡讓ESP32休眠或無限循環，以免它自動重啟
     # while True:
@@ -1,296 +1,696 @@
-# --- oled_display.py (整合成功版本和新功能) ---
-
-import network
-import urequests
-import time
-from machine import Pin, I2C
-import ssd1306
-
-class OledChineseDisplay:
-    """
-    一個用於在 SSD1306 OLED 顯示器上顯示中文的類別。
-
-    它透過一個外部的 Flask API 來取得中文字的點陣圖資料，
-    並支援靜態顯示與跑馬燈捲動模式。
-    """
-
-    # 在這裡新增 default_font_size 參數
-    def __init__(self, scl_pin, sda_pin, font_api_url, width=128, height=64, scroll_mode=True, default_font_size=24):
-        """
-        初始化顯示器類別。
-
-        Args:
-            scl_pin (int): I2C SCL 接腳編號。
-            sda_pin (int): I2C SDA 接腳編號。
-            font_api_url (str): 用於取得字型點陣圖的 Flask API 位址。
-            width (int, optional): OLED 寬度。預設為 128。
-            height (int, optional): OLED 高度。預設為 64。
-            scroll_mode (bool, optional): 是否啟用跑馬燈模式。預設為 True。
-            default_font_size (int, optional): 預設的字體大小。預設為 24。
-        """
-        self.scl_pin = scl_pin
-        self.sda_pin = sda_pin
-        self.width = width
-        self.height = height
-        self.font_api_url = font_api_url
-        self.scroll_mode = scroll_mode
-        self.default_font_size = default_font_size # 新增預設字體大小屬性
-        self.chinese_font_cache = {} # 新增一個快取字典 { (char, font_size): bitmap_data }
-        
-        self.i2c = None
-        self.oled = None
-        self.wlan = network.WLAN(network.STA_IF)
-
-        # 自動初始化OLED
-        if not self._init_oled():
-            raise RuntimeError("OLED 初始化失敗！")
-
-    def _init_oled(self):
-        """ (內部方法) 初始化 I2C 和 OLED 顯示器。"""
-        try:
-            # 保持 I2C 頻率為 400000，因為這是您成功運行的頻率
-            self.i2c = I2C(0, scl=Pin(self.scl_pin), sda=Pin(self.sda_pin), freq=400000) 
-            self.oled = ssd1306.SSD1306_I2C(self.width, self.height, self.i2c)
-            print("✅ OLED 初始化成功")
-            self.show_message("System Booting...", "OLED Ready")
-            time.sleep(1)
-            return True
-        except Exception as e:
-            print(f"❌ OLED 初始化失敗: {e}")
-            return False
-
-    def connect_wifi(self, ssid, password, timeout=30):
-        """
-        連接到 Wi-Fi 網路。
-        Args:
-            ssid (str): Wi-Fi 的 SSID。
-            password (str): Wi-Fi 的密碼。
-            timeout (int, optional): 連線逾時秒數。預設為 30。
-        Returns:
-            bool: 連線成功返回 True，失敗返回 False。
-        """
-        self.wlan.active(True)
-        if self.wlan.isconnected():
-            print("✅ 已連接到 Wi-Fi")
-            return True
-        
-        print(f"🔄 正在連接到 {ssid}...")
-        self.show_message("Connecting WiFi", ssid)
-        
-        self.wlan.connect(ssid, password)
-        
-        start_time = time.time()
-        while not self.wlan.isconnected():
-            if time.time() - start_time > timeout:
-                print("❌ Wi-Fi 連接逾時")
-                self.show_message("WiFi Failed!", "Timeout")
-                return False
-            time.sleep(0.5)
-        
-        ip = self.wlan.ifconfig()[0]
-        print(f"\n✅ Wi-Fi 連接成功! IP位址: {ip}")
-        self.show_message("WiFi Connected!", ip, clear_after=2)
-        return True
-
-    @staticmethod
-    def _urlencode_chinese(text):
-        """ (靜態方法) 將文字中的所有 URL 不安全字符（包括中文字元和空白）轉換為 URL 編碼。"""
-        safe_chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_.~"
-        encoded_result = ""
-        for char in text:
-            if char in safe_chars:
-                encoded_result += char
-            else:
-                utf8_bytes = char.encode('utf-8')
-                for byte in utf8_bytes:
-                    encoded_result += f"%{byte:02X}"
-        return encoded_result
-
-    # 新增 _fetch_single_char_bitmap 函數以支援快取和 font_size 傳遞
-    def _fetch_single_char_bitmap(self, char, font_size):
-        """ (內部方法) 專門用於從 Flask API 獲取單個字元的點陣圖（帶快取）。"""
-        cache_key = (char, font_size)
-        if cache_key in self.chinese_font_cache:
-            return self.chinese_font_cache[cache_key]
-
-        try:
-            encoded_char = self._urlencode_chinese(char)
-            # Flask API 現在會接收 font_size 參數
-            url = f"{self.font_api_url}text={encoded_char}&font_size={font_size}"
-            
-            response = urequests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                response.close()
-                if data.get('success', False):
-                    self.chinese_font_cache[cache_key] = data
-                    return data
-            print(f"❌ HTTP 錯誤或 API 錯誤 ({char}): {response.status_code}")
-            response.close()
-            return None
-        except Exception as e:
-            print(f"❌ 請求單個字元 '{char}' 時發生錯誤: {e}")
-            return None
-
-    # 修改 _fetch_font_bitmap 以使用 _fetch_single_char_bitmap 和 font_size
-    def _fetch_font_bitmap(self, text, font_size=None):
-        """ (內部方法) 從 Flask API 取得整個字串的點陣圖，並利用字元快取和拼接。"""
-        actual_font_size = font_size if font_size is not None else self.default_font_size
-        
-        full_bitmap_data = {
-            'bitmap': [],
-            'width': 0,
-            'height': 0,
-            'success': True
-        }
-        
-        all_char_bitmaps = []
-        max_height = 0
-        total_width = 0
-
-        # 計算總寬度並獲取每個字元的點陣圖數據
-        for char in text:
-            char_data = self._fetch_single_char_bitmap(char, actual_font_size)
-            if char_data and char_data['success']:
-                all_char_bitmaps.append(char_data)
-                total_width += char_data['width']
-                if char_data['height'] > max_height:
-                    max_height = char_data['height']
-            else:
-                print(f"❌ 無法獲取字元 '{char}' 的點陣圖，可能導致顯示不完整或失敗。")
-                full_bitmap_data['success'] = False
-                return None # 任何字元獲取失敗就返回None
-
-        if not all_char_bitmaps:
-            print("警告: 沒有字元可以顯示或所有字元獲取失敗。")
-            return None # 如果沒有任何字元
-
-        # 初始化一個大的點陣圖緩衝區來拼接所有字元
-        full_bitmap = [[0 for _ in range(total_width)] for _ in range(max_height)]
-
-        current_x = 0
-        for char_data in all_char_bitmaps:
-            char_bitmap = char_data['bitmap']
-            char_width = char_data['width']
-            char_height = char_data['height']
-            
-            # 計算垂直偏移量，實現底部對齊
-            y_offset_for_char = max_height - char_height 
-            
-            # 將每個字元的點陣圖繪製到大點陣圖上
-            for y in range(char_height):
-                for x in range(char_width):
-                    if char_bitmap[y][x]:
-                        full_bitmap[y_offset_for_char + y][current_x + x] = 1
-            current_x += char_width
-            
-        full_bitmap_data['bitmap'] = full_bitmap
-        full_bitmap_data['width'] = total_width
-        full_bitmap_data['height'] = max_height
-
-        return full_bitmap_data
-            
-    # 修改 _render_bitmap 以支援可變跑馬燈速度
-    def _render_bitmap(self, bitmap_data, speed=0.08): 
-        """ (內部方法) 根據 scroll_mode 決定如何繪製點陣圖。"""
-        bitmap = bitmap_data['bitmap']
-        width = bitmap_data['width']
-        height = bitmap_data['height']
-        y_offset = (self.height - height) // 2 # 將文字垂直居中
-
-        if self.scroll_mode:
-            # 跑馬燈模式
-            total_scroll_width = self.width + width
-            scroll_step = 2 # 每次移動 2 像素，可以調整
-            
-            for offset in range(0, total_scroll_width + scroll_step, scroll_step):
-                self.oled.fill(0)
-                for y in range(height):
-                    for x in range(width):
-                        if bitmap[y][x]:
-                            px = self.width - offset + x
-                            py = y_offset + y
-                            if 0 <= px < self.width:
-                                self.oled.pixel(px, py, 1)
-                self.oled.show()
-                time.sleep(speed) 
-        else:
-            # 靜態居中顯示
-            self.oled.fill(0)
-            x_offset = (self.width - width) // 2
-            for y in range(height):
-                for x in range(width):
-                    if bitmap[y][x]:
-                        self.oled.pixel(x_offset + x, y_offset + y, 1)
-            self.oled.show()
-                
-    # 修改 display 以支援 font_size 和 scroll_speed 參數
-    def display(self, texts, delay_between_texts=1, font_size=None, scroll_speed=0.08):
-        """
-        在 OLED 上顯示一系列文字。這是你主要會呼叫的方法。
-
-        Args:
-            texts (list or str): 一個包含多個字串的列表，或單一字串。
-            delay_between_texts (int, optional): 每則訊息之間的延遲秒數。預設為 1。
-            font_size (int, optional): 要使用的字體大小。如果未提供，則使用初始化時的 default_font_size。
-            scroll_speed (float, optional): 跑馬燈捲動速度。預設為 0.08。
-        """
-        if isinstance(texts, str):
-            texts = [texts]
-
-        print("\n🎯 開始顯示文字...")
-        for text in texts:
-            print(f"--- 正在處理: {text} ---")
-            # show_message 這裡也應傳入 font_size，但目前 show_message 只支援 1 或 2，所以暫不傳遞實際字體大小
-            self.show_message("Fetching Font...", text, font_size=1) 
-            
-            font_data = self._fetch_font_bitmap(text, font_size) 
-            
-            if font_data:
-                self._render_bitmap(font_data, speed=scroll_speed) 
-                print(f"✅ '{text}' 顯示完成")
-            else:
-                print(f"❌ '{text}' 顯示失敗")
-                self.show_message("Font Error!", "Check API server", clear_after=2)
-            
-            time.sleep(delay_between_texts)
-        print("🎉 所有文字顯示完畢!")
-
-    # 新增 display_small_text 函數
-    def display_small_text(self, texts, delay_between_texts=1, half_size_multiplier=0.5, scroll_speed=0.08):
-        """
-        以比預設字體小一半的大小顯示中文文字。
-
-        Args:
-            texts (list or str): 一個包含多個字串的列表，或單一字串。
-            delay_between_texts (int, optional): 每則訊息之間的延遲秒數。預設為 1。
-            half_size_multiplier (float, optional): 縮小倍數。0.5 表示縮小一半。
-            scroll_speed (float, optional): 跑馬燈捲動速度。預設為 0.08。
-        """
-        smaller_font_size = max(1, int(self.default_font_size * half_size_multiplier))
-        print(f"INFO: 將使用字體大小: {smaller_font_size}")
-        self.display(texts, delay_between_texts=delay_between_texts, font_size=smaller_font_size, scroll_speed=scroll_speed)
-
-    def show_message(self, line1, line2="", font_size=1, clear_after=0):
-        """
-        在螢幕上顯示簡單的英文字串訊息。
-        Args:
-            line1 (str): 第一行文字。
-            line2 (str): 第二行文字 (可選)。
-            font_size (int): 字體大小 (1=8px高, 2=16px高)。 # 這裡的 font_size 是指 SSD1306 驅動本身的內建字體大小
-            clear_after (int): 顯示後幾秒自動清除。0為不清除。
-        """
-        self.oled.fill(0)
-        char_height = 8 * font_size
-        self.oled.text(line1, 0, 0)
-        if line2:
-            self.oled.text(line2, 0, char_height + 2)
-        self.oled.show()
-        if clear_after > 0:
-            time.sleep(clear_after)
-            self.clear()
-
-    def clear(self):
-        """ 清除螢幕。"""
-        self.oled.fill(0)
-        self.oled.show()
\ No newline at end of file
+# --- oled_display.py (整合成功版本和新功能) ---
+
+import network
+import socket
+import uasyncio
+import ujson
+import ubinascii
+import time
+import framebuf
+from collections import OrderedDict
+from machine import Pin, I2C
+import ssd1306
+
+# 預先建好 256 筆的百分比編碼表，URL 編碼時查表就好，
+# 不用每個 byte 都跑一次字串格式化
+_PCT_ENCODE = ['%%%02X' % b for b in range(256)]
+
+# URL 安全字元的 byte 值集合，查詢是 O(1)（原本是對字串做線性掃描）
+_SAFE_BYTES = frozenset(
+    ord(c) for c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_.~"
+)
+
+class OledChineseDisplay:
+    """
+    一個用於在 SSD1306 OLED 顯示器上顯示中文的類別。
+
+    它透過一個外部的 Flask API 來取得中文字的點陣圖資料，
+    並支援靜態顯示與跑馬燈捲動模式。
+    """
+
+    # 在這裡新增 default_font_size 參數
+    def __init__(self, scl_pin, sda_pin, font_api_url, width=128, height=64, scroll_mode=True, default_font_size=24):
+        """
+        初始化顯示器類別。
+
+        Args:
+            scl_pin (int): I2C SCL 接腳編號。
+            sda_pin (int): I2C SDA 接腳編號。
+            font_api_url (str): 用於取得字型點陣圖的 Flask API 位址。
+            width (int, optional): OLED 寬度。預設為 128。
+            height (int, optional): OLED 高度。預設為 64。
+            scroll_mode (bool, optional): 是否啟用跑馬燈模式。預設為 True。
+            default_font_size (int, optional): 預設的字體大小。預設為 24。
+        """
+        self.scl_pin = scl_pin
+        self.sda_pin = sda_pin
+        self.width = width
+        self.height = height
+        self.font_api_url = font_api_url
+        self.scroll_mode = scroll_mode
+        self.default_font_size = default_font_size # 新增預設字體大小屬性
+        # 字元快取 { font_size: OrderedDict { char: bitmap_data } }：
+        # 外層按字體大小分組（查詢不用每次配置 (char, font_size) tuple、也能按大小整組淘汰），
+        # 內層 OrderedDict 實作固定容量的 LRU —
+        # ESP32 heap 只有約 520KB，無上限快取會在長時間運行後 OOM
+        self.chinese_font_cache = {}
+        self._cache_cap = 128 # 每種字體大小各自的容量上限
+        # 整行快取 { (text, font_size): 拼接完成的點陣圖 }：
+        # 重複顯示同一句話時直接跳過網路請求與拼接
+        self._line_cache = OrderedDict()
+        self._line_cache_cap = 32
+
+        # 解析 API URL 的 host / port / path，供 uasyncio 原始 socket 連線使用
+        url = font_api_url
+        if url.startswith("http://"):
+            url = url[7:]
+        host_part, _, path_part = url.partition('/')
+        if ':' in host_part:
+            self._api_host, api_port = host_part.split(':', 1)
+            self._api_port = int(api_port)
+        else:
+            self._api_host = host_part
+            self._api_port = 80
+        self._api_path = '/' + path_part
+        self._sock = None # 持久 keep-alive 連線，第一次請求時建立
+        self._rx_buf = bytearray(2048) # 可重複使用的接收緩衝區，避免每次請求都配置新的 body
+        self._glyph_scratch = bytearray(256) # 解碼字元點陣圖用的暫存區，同樣重複使用
+        
+        self.i2c = None
+        self.oled = None
+        self.wlan = network.WLAN(network.STA_IF)
+
+        # 自動初始化OLED
+        if not self._init_oled():
+            raise RuntimeError("OLED 初始化失敗！")
+
+    def _init_oled(self):
+        """ (內部方法) 初始化 I2C 和 OLED 顯示器。"""
+        # SSD1306 在好的接線下可以跑 fast-mode+ 的 1MHz，
+        # 整幅更新從約 25ms 降到約 10ms；失敗時退回穩定的 400kHz
+        for freq in (1000000, 400000):
+            try:
+                self.i2c = I2C(0, scl=Pin(self.scl_pin), sda=Pin(self.sda_pin), freq=freq)
+                self.oled = ssd1306.SSD1306_I2C(self.width, self.height, self.i2c)
+                print(f"✅ OLED 初始化成功 (I2C {freq // 1000}kHz)")
+                self.show_message("System Booting...", "OLED Ready")
+                time.sleep(1)
+                return True
+            except Exception as e:
+                print(f"❌ OLED 初始化失敗 (I2C {freq // 1000}kHz): {e}")
+        return False
+
+    def connect_wifi(self, ssid, password, timeout=30):
+        """
+        連接到 Wi-Fi 網路。
+        Args:
+            ssid (str): Wi-Fi 的 SSID。
+            password (str): Wi-Fi 的密碼。
+            timeout (int, optional): 連線逾時秒數。預設為 30。
+        Returns:
+            bool: 連線成功返回 True，失敗返回 False。
+        """
+        self.wlan.active(True)
+        if self.wlan.isconnected():
+            print("✅ 已連接到 Wi-Fi")
+            return True
+        
+        print(f"🔄 正在連接到 {ssid}...")
+        self.show_message("Connecting WiFi", ssid)
+        
+        self.wlan.connect(ssid, password)
+        
+        start_time = time.time()
+        while not self.wlan.isconnected():
+            if time.time() - start_time > timeout:
+                print("❌ Wi-Fi 連接逾時")
+                self.show_message("WiFi Failed!", "Timeout")
+                return False
+            time.sleep(0.5)
+        
+        ip = self.wlan.ifconfig()[0]
+        print(f"\n✅ Wi-Fi 連接成功! IP位址: {ip}")
+        self.show_message("WiFi Connected!", ip, clear_after=2)
+        return True
+
+    # 新增非阻塞版本的 Wi-Fi 連線：等待時讓出控制權給事件迴圈，
+    # 呼叫端可以同時執行進度動畫等 UI 任務
+    async def connect_wifi_async(self, ssid, password, timeout=30):
+        """
+        連接到 Wi-Fi 網路（uasyncio 非阻塞版本）。
+
+        等待連線時用 uasyncio.sleep 讓出控制權，
+        可以和其他任務（例如連線動畫）一起 uasyncio.gather 執行。
+
+        Args:
+            ssid (str): Wi-Fi 的 SSID。
+            password (str): Wi-Fi 的密碼。
+            timeout (int, optional): 連線逾時秒數。預設為 30。
+        Returns:
+            bool: 連線成功返回 True，失敗返回 False。
+        """
+        self.wlan.active(True)
+        if self.wlan.isconnected():
+            print("✅ 已連接到 Wi-Fi")
+            return True
+
+        print(f"🔄 正在連接到 {ssid}...")
+        self.show_message("Connecting WiFi", ssid)
+
+        self.wlan.connect(ssid, password)
+
+        start_time = time.time()
+        while not self.wlan.isconnected():
+            if time.time() - start_time > timeout:
+                print("❌ Wi-Fi 連接逾時")
+                self.show_message("WiFi Failed!", "Timeout")
+                return False
+            await uasyncio.sleep(0.5)
+
+        ip = self.wlan.ifconfig()[0]
+        print(f"\n✅ Wi-Fi 連接成功! IP位址: {ip}")
+        self.show_message("WiFi Connected!", ip, clear_after=2)
+        return True
+
+    @staticmethod
+    def _urlencode_chinese(text):
+        """ (靜態方法) 將文字中的所有 URL 不安全字符（包括中文字元和空白）轉換為 URL 編碼。"""
+        # 整個字串只做一次 UTF-8 編碼，之後逐 byte 查 O(1) 的安全字元集合；
+        # 收集片段最後一次 join，避免 += 造成 O(n) 次字串重新配置
+        parts = []
+        for byte in text.encode('utf-8'):
+            if byte in _SAFE_BYTES:
+                parts.append(chr(byte))
+            else:
+                parts.append(_PCT_ENCODE[byte])
+        return "".join(parts)
+
+    # 新增持久連線：每次 urequests.get 都要重新 TCP 交握，
+    # 改用單一 keep-alive socket 讓後續請求省掉交握的來回
+    def _ensure_sock(self):
+        """ (內部方法) 確保持久 keep-alive 連線已建立，回傳 socket。"""
+        if self._sock is None:
+            addr = socket.getaddrinfo(self._api_host, self._api_port)[0][-1]
+            s = socket.socket()
+            s.settimeout(10)
+            s.connect(addr)
+            self._sock = s
+        return self._sock
+
+    def _close_sock(self):
+        """ (內部方法) 關閉持久連線（出錯或 deinit 時呼叫）。"""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except Exception:
+                pass
+            self._sock = None
+
+    def _http_get_json(self, query):
+        """ (內部方法) 透過持久連線發出 GET 並解析 JSON 回應；失敗時重連一次。"""
+        for attempt in range(2):
+            try:
+                s = self._ensure_sock()
+                request_line = (
+                    f"GET {self._api_path}{query} HTTP/1.1\r\n"
+                    f"Host: {self._api_host}\r\n"
+                    "Connection: keep-alive\r\n\r\n"
+                )
+                s.write(request_line.encode('utf-8'))
+
+                status_line = s.readline()
+                content_length = 0
+                keep_alive = True
+                while True:
+                    line = s.readline()
+                    if not line or line == b"\r\n":
+                        break
+                    lowered = line.lower()
+                    if lowered.startswith(b"content-length:"):
+                        content_length = int(line.split(b":", 1)[1])
+                    elif lowered.startswith(b"connection:") and b"close" in lowered:
+                        keep_alive = False
+
+                # 把 body 直接讀進可重複使用的緩衝區（readinto 不會配置新物件），
+                # 再讓 ujson 從 memoryview 解析，省掉一份完整 body 的中間複本
+                if content_length > len(self._rx_buf):
+                    self._rx_buf = bytearray(content_length) # 很少發生：一次加大後重複使用
+                body_mv = memoryview(self._rx_buf)[:content_length]
+                read_n = 0
+                while read_n < content_length:
+                    n = s.readinto(body_mv[read_n:])
+                    if not n:
+                        raise OSError("連線在讀取回應時中斷")
+                    read_n += n
+                if not keep_alive:
+                    self._close_sock()
+
+                if b"200" not in status_line:
+                    print(f"❌ HTTP 錯誤: {status_line}")
+                    return None
+                return ujson.loads(body_mv)
+            except Exception as e:
+                # 連線可能已被伺服器關閉，重連一次再試
+                self._close_sock()
+                if attempt == 1:
+                    print(f"❌ 持久連線請求失敗: {e}")
+        return None
+
+    # 新增 _pack_bitmap：把 JSON 的 list-of-lists 點陣圖壓成 SSD1306 頁格式的 bytearray。
+    # 24x24 的字在 MicroPython 上 list-of-lists 約佔 10-20KB，壓縮後只有 72 bytes
+    @staticmethod
+    def _pack_bitmap(bitmap, width, height):
+        """ (靜態方法) 將 0/1 的 list-of-lists 壓成 MONO_VLSB（頁對齊）bytearray。"""
+        pages = (height + 7) // 8
+        buf = bytearray(pages * width)
+        for y in range(height):
+            row = bitmap[y]
+            page_base = (y >> 3) * width
+            bit = 1 << (y & 7)
+            for x in range(width):
+                if row[x]:
+                    buf[page_base + x] |= bit
+        return buf
+
+    # 新增 LRU 快取存取方法：命中時移到最新端，寫入時淘汰最舊的項目
+    def _cache_has(self, char, font_size):
+        """ (內部方法) 查詢字元是否已在快取（不調整 LRU 順序）。"""
+        sub_cache = self.chinese_font_cache.get(font_size)
+        return sub_cache is not None and char in sub_cache
+
+    def _cache_get(self, char, font_size):
+        """ (內部方法) 讀取字元快取；命中時把該項目移到最新端（LRU）。"""
+        sub_cache = self.chinese_font_cache.get(font_size)
+        if sub_cache is None:
+            return None
+        data = sub_cache.pop(char, None)
+        if data is not None:
+            sub_cache[char] = data # 重新插入 = 移到最新端
+        return data
+
+    def _cache_put(self, char, font_size, data):
+        """ (內部方法) 寫入字元快取（壓成 bytearray），超過容量時淘汰最久未用的項目。
+
+        Returns:
+            dict: 實際存入快取的資料 {'buf', 'width', 'height', 'success'}。
+        """
+        if 'buf' not in data:
+            width = data['width']
+            height = data['height']
+            if 'bitmap_b64' in data:
+                # 新版 API：base64 的 1-bpp MONO_HLSB，解碼到可重複使用的暫存區
+                # （不為每個字元配置一個臨時緩衝），再用 C 層 blit 轉成 VLSB
+                raw = ubinascii.a2b_base64(data['bitmap_b64'])
+                if len(raw) > len(self._glyph_scratch):
+                    self._glyph_scratch = bytearray(len(raw))
+                self._glyph_scratch[:len(raw)] = raw
+                src_fb = framebuf.FrameBuffer(
+                    memoryview(self._glyph_scratch)[:len(raw)],
+                    width, height, framebuf.MONO_HLSB
+                )
+                buf = bytearray(((height + 7) // 8) * width)
+                framebuf.FrameBuffer(buf, width, height, framebuf.MONO_VLSB).blit(src_fb, 0, 0)
+            else:
+                # 舊版 API：list-of-lists 的 0/1，逐像素打包
+                buf = self._pack_bitmap(data['bitmap'], width, height)
+            data = {
+                'buf': buf,
+                'width': width,
+                'height': height,
+                'success': True,
+            }
+        sub_cache = self.chinese_font_cache.get(font_size)
+        if sub_cache is None:
+            sub_cache = self.chinese_font_cache[font_size] = OrderedDict()
+        sub_cache[char] = data
+        while len(sub_cache) > self._cache_cap:
+            oldest_char = next(iter(sub_cache))
+            del sub_cache[oldest_char]
+        return data
+
+    # 新增 _fetch_single_char_bitmap 函數以支援快取和 font_size 傳遞
+    def _fetch_single_char_bitmap(self, char, font_size):
+        """ (內部方法) 專門用於從 Flask API 獲取單個字元的點陣圖（帶快取）。"""
+        cached = self._cache_get(char, font_size)
+        if cached is not None:
+            return cached
+
+        try:
+            encoded_char = self._urlencode_chinese(char)
+            # Flask API 現在會接收 font_size 參數，走持久 keep-alive 連線
+            data = self._http_get_json(f"text={encoded_char}&font_size={font_size}")
+            if data and data.get('success', False):
+                return self._cache_put(char, font_size, data)
+            print(f"❌ HTTP 錯誤或 API 錯誤 ({char})")
+            return None
+        except Exception as e:
+            print(f"❌ 請求單個字元 '{char}' 時發生錯誤: {e}")
+            return None
+
+    # 新增 _fetch_missing_chars：把所有快取未命中的字元合併成「一次」HTTP 請求，
+    # 避免 N 個字元就要 N 次 Wi-Fi 來回（延遲以來回次數為主，不是運算量）
+    def _fetch_missing_chars(self, miss_chars, font_size):
+        """ (內部方法) 一次批次請求多個未快取字元的點陣圖，並填入快取。
+
+        成功時返回 True；失敗時返回 False（呼叫端可退回逐字請求）。
+        """
+        if not miss_chars:
+            return True
+
+        try:
+            encoded_text = self._urlencode_chinese(miss_chars)
+            # per_char=1 讓伺服器逐字渲染，回傳每個字元各自的點陣圖（走持久連線）
+            data = self._http_get_json(f"text={encoded_text}&font_size={font_size}&per_char=1")
+            if data and data.get('success', False):
+                for char_data in data.get('chars', []):
+                    self._cache_put(char_data['char'], font_size, char_data)
+                return True
+            print(f"❌ 批次請求失敗: '{miss_chars}'")
+            return False
+        except Exception as e:
+            print(f"❌ 批次請求字元 '{miss_chars}' 時發生錯誤: {e}")
+            return False
+
+    # 新增 uasyncio 併發請求：批次失敗時，讓所有未命中字元的請求「同時」在線上，
+    # 總等待時間約等於最慢的一次來回，而不是所有來回的總和
+    async def _afetch_char_bitmap(self, char, font_size):
+        """ (內部方法) 透過 uasyncio 原始 socket 抓取單個字元的點陣圖並填入快取。"""
+        writer = None
+        try:
+            reader, writer = await uasyncio.open_connection(self._api_host, self._api_port)
+            encoded_char = self._urlencode_chinese(char)
+            request_line = (
+                f"GET {self._api_path}text={encoded_char}&font_size={font_size} HTTP/1.0\r\n"
+                f"Host: {self._api_host}\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(request_line.encode('utf-8'))
+            await writer.drain()
+
+            status_line = await reader.readline()
+            if b"200" not in status_line:
+                print(f"❌ 併發請求 HTTP 錯誤 ({char}): {status_line}")
+                return
+            # 跳過其餘 HTTP 標頭
+            while True:
+                line = await reader.readline()
+                if not line or line == b"\r\n":
+                    break
+
+            body = await reader.read(-1)
+            data = ujson.loads(body)
+            if data.get('success', False):
+                self._cache_put(char, font_size, data)
+        except Exception as e:
+            print(f"❌ 併發請求字元 '{char}' 時發生錯誤: {e}")
+        finally:
+            if writer:
+                writer.close()
+
+    def _fetch_chars_concurrent(self, chars, font_size):
+        """ (內部方法) 對多個字元同時發出請求（uasyncio.gather），填入快取。"""
+        if not chars:
+            return
+
+        async def _gather_all():
+            tasks = [self._afetch_char_bitmap(char, font_size) for char in chars]
+            await uasyncio.gather(*tasks)
+
+        try:
+            uasyncio.run(_gather_all())
+        except Exception as e:
+            print(f"❌ 併發請求 '{chars}' 時發生錯誤: {e}")
+
+    # 修改 _fetch_font_bitmap：先查快取，未命中的字元「一次」批次抓回，再拼接
+    def _fetch_font_bitmap(self, text, font_size=None):
+        """ (內部方法) 從 Flask API 取得整個字串的點陣圖，並利用字元快取和拼接。"""
+        actual_font_size = font_size if font_size is not None else self.default_font_size
+
+        full_bitmap_data = {
+            'buf': None,
+            'width': 0,
+            'height': 0,
+            'success': True
+        }
+
+        all_char_bitmaps = []
+        max_height = 0
+        total_width = 0
+
+        # 先收集快取未命中的字元，合併成單一請求（N 次來回 → 1 次來回）
+        miss_chars = ""
+        for char in text:
+            if not self._cache_has(char, actual_font_size) and char not in miss_chars:
+                miss_chars += char
+        self._fetch_missing_chars(miss_chars, actual_font_size)
+
+        # 批次沒補齊的字元改用 uasyncio 併發請求（同時在線上，等待時間 ≈ 最慢一次來回）
+        still_miss = ""
+        for char in miss_chars:
+            if not self._cache_has(char, actual_font_size):
+                still_miss += char
+        self._fetch_chars_concurrent(still_miss, actual_font_size)
+
+        # 計算總寬度並獲取每個字元的點陣圖數據（批次失敗的字元會退回逐字請求）
+        for char in text:
+            char_data = self._cache_get(char, actual_font_size)
+            if char_data is None:
+                char_data = self._fetch_single_char_bitmap(char, actual_font_size)
+            if char_data and char_data['success']:
+                all_char_bitmaps.append(char_data)
+                total_width += char_data['width']
+                if char_data['height'] > max_height:
+                    max_height = char_data['height']
+            else:
+                print(f"❌ 無法獲取字元 '{char}' 的點陣圖，可能導致顯示不完整或失敗。")
+                full_bitmap_data['success'] = False
+                return None # 任何字元獲取失敗就返回None
+
+        if not all_char_bitmaps:
+            print("警告: 沒有字元可以顯示或所有字元獲取失敗。")
+            return None # 如果沒有任何字元
+
+        # 直接把每個字元的壓縮點陣圖用 C 層 blit 拼進整行的 framebuffer，
+        # 不再經過 list-of-lists 的中間表示（省掉數萬次直譯器迴圈）
+        full_buf = bytearray(((max_height + 7) // 8) * total_width)
+        full_fb = framebuf.FrameBuffer(full_buf, total_width, max_height, framebuf.MONO_VLSB)
+
+        current_x = 0
+        for char_data in all_char_bitmaps:
+            char_width = char_data['width']
+            char_height = char_data['height']
+            char_fb = framebuf.FrameBuffer(
+                char_data['buf'], char_width, char_height, framebuf.MONO_VLSB
+            )
+            # 垂直偏移實現底部對齊
+            full_fb.blit(char_fb, current_x, max_height - char_height)
+            current_x += char_width
+
+        full_bitmap_data['buf'] = full_buf
+        full_bitmap_data['width'] = total_width
+        full_bitmap_data['height'] = max_height
+
+        return full_bitmap_data
+            
+    # 新增 _show_partial：oled.show() 每次都推滿 1024 bytes（400kHz 下約 25ms），
+    # 跑馬燈其實只有文字所在的頁面列在變，只推那幾頁就好
+    def _show_partial(self, y0, y1):
+        """ (內部方法) 只把涵蓋 y0..y1 像素列的頁面推到 OLED，減少 I2C 傳輸量。"""
+        page0 = y0 >> 3
+        page1 = y1 >> 3 # 含端點
+        try:
+            oled = self.oled
+            oled.write_cmd(0x21) # SET_COL_ADDR
+            oled.write_cmd(0)
+            oled.write_cmd(self.width - 1)
+            oled.write_cmd(0x22) # SET_PAGE_ADDR
+            oled.write_cmd(page0)
+            oled.write_cmd(page1)
+            oled.write_data(memoryview(oled.buffer)[page0 * self.width:(page1 + 1) * self.width])
+        except AttributeError:
+            # 驅動版本沒有底層的 write_cmd/write_data 時退回整幅更新
+            self.oled.show()
+
+    # 修改 _render_bitmap：改用 framebuf.blit（C 實作），
+    # 跑馬燈每一步從數萬次 oled.pixel() 直譯器呼叫降成一次 blit
+    def _render_bitmap(self, bitmap_data, speed=0.08):
+        """ (內部方法) 根據 scroll_mode 決定如何繪製點陣圖。"""
+        width = bitmap_data['width']
+        height = bitmap_data['height']
+        y_offset = (self.height - height) // 2 # 將文字垂直居中
+
+        # 整個字串只組建一次壓縮點陣圖，之後每一步都只是 C 層操作
+        src_buf = bitmap_data.get('buf')
+        if src_buf is None:
+            src_buf = self._pack_bitmap(bitmap_data['bitmap'], width, height)
+        src_fb = framebuf.FrameBuffer(src_buf, width, height, framebuf.MONO_VLSB)
+
+        if self.scroll_mode:
+            # 跑馬燈模式：畫面內容用 C 層 scroll 往左平移，
+            # 每一步只補畫右緣新進入的窄條，不重畫整個畫面
+            total_scroll_width = self.width + width
+            scroll_step = 2 # 起始步距；推送跟不上目標幀時會自動加大
+            target_ms = int(speed * 1000) # 每一步的目標幀時（speed 秒）
+
+            self.oled.fill(0)
+            self.oled.show() # 先整幅清一次，之後每一步只推文字所在的頁面
+
+            src_mv = memoryview(src_buf) # 只建一次 view，迴圈內不再每步重建
+
+            # 文字實際佔用的像素列範圍（部分更新只推這個區間的頁面）
+            band_y0 = y_offset if y_offset > 0 else 0
+            band_y1 = y_offset + height - 1
+            if band_y1 > self.height - 1:
+                band_y1 = self.height - 1
+
+            offset = 0
+            while offset <= total_scroll_width:
+                t0 = time.ticks_ms()
+                self.oled.scroll(-scroll_step, 0)
+                # 清掉平移後右緣殘留的舊欄位
+                self.oled.fill_rect(self.width - scroll_step, 0, scroll_step, self.height, 0)
+
+                # 本步新進入畫面的來源欄範圍 [strip_start, strip_end)
+                strip_start = offset - scroll_step
+                if strip_start < 0:
+                    strip_start = 0
+                strip_end = offset if offset < width else width
+                if strip_end > strip_start:
+                    # MONO_VLSB 的同一頁內欄位連續，用 stride 直接取來源的欄區段
+                    strip_fb = framebuf.FrameBuffer(
+                        src_mv[strip_start:],
+                        strip_end - strip_start, height,
+                        framebuf.MONO_VLSB, width
+                    )
+                    self.oled.blit(strip_fb, self.width - offset + strip_start, y_offset)
+                self._show_partial(band_y0, band_y1)
+
+                # 量測實際幀時：比目標快就補睡差額，比目標慢（I2C 受限）
+                # 就加大步距跳幀，讓視覺上的捲動速度維持一致
+                if target_ms > 0:
+                    dt = time.ticks_diff(time.ticks_ms(), t0)
+                    if dt < target_ms:
+                        time.sleep_ms(target_ms - dt)
+                    elif dt > target_ms:
+                        new_step = scroll_step * dt // target_ms
+                        scroll_step = 8 if new_step > 8 else new_step
+
+                offset += scroll_step
+        else:
+            # 靜態居中顯示
+            self.oled.fill(0)
+            x_offset = (self.width - width) // 2
+            self.oled.blit(src_fb, x_offset, y_offset)
+            self.oled.show()
+                
+    # 新增 prewarm：連上 Wi-Fi 後先把常用字元抓進快取，
+    # 第一次 display() 就能以快取速度渲染，不用付出冷啟動的網路延遲
+    def prewarm(self, chars, font_size=None):
+        """
+        預先抓取一批常用字元的點陣圖填入快取。
+
+        建議在 connect_wifi 成功後呼叫，傳入接下來要顯示的字串
+        或常用字元集合；整批字元只用一次 HTTP 請求。
+
+        Args:
+            chars (str): 要預熱的字元（重複與已快取的字元會自動略過）。
+            font_size (int, optional): 字體大小。預設使用 default_font_size。
+        """
+        actual_font_size = font_size if font_size is not None else self.default_font_size
+
+        miss_chars = ""
+        for char in chars:
+            if not self._cache_has(char, actual_font_size) and char not in miss_chars:
+                miss_chars += char
+        if miss_chars:
+            print(f"🔥 預熱字元快取: {len(miss_chars)} 個字元")
+            self._fetch_missing_chars(miss_chars, actual_font_size)
+
+    # 修改 display 以支援 font_size 和 scroll_speed 參數
+    def display(self, texts, delay_between_texts=1, font_size=None, scroll_speed=0.08):
+        """
+        在 OLED 上顯示一系列文字。這是你主要會呼叫的方法。
+
+        Args:
+            texts (list or str): 一個包含多個字串的列表，或單一字串。
+            delay_between_texts (int, optional): 每則訊息之間的延遲秒數。預設為 1。
+            font_size (int, optional): 要使用的字體大小。如果未提供，則使用初始化時的 default_font_size。
+            scroll_speed (float, optional): 跑馬燈捲動速度。預設為 0.08。
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+
+        actual_font_size = font_size if font_size is not None else self.default_font_size
+
+        print("\n🎯 開始顯示文字...")
+        for text in texts:
+            print(f"--- 正在處理: {text} ---")
+
+            # 先查整行快取：同一句話第二次顯示時不用再走網路和拼接
+            line_key = (text, actual_font_size)
+            font_data = self._line_cache.pop(line_key, None)
+            if font_data is not None:
+                self._line_cache[line_key] = font_data # 重新插入 = 移到最新端
+            else:
+                # show_message 這裡也應傳入 font_size，但目前 show_message 只支援 1 或 2，所以暫不傳遞實際字體大小
+                self.show_message("Fetching Font...", text, font_size=1)
+                font_data = self._fetch_font_bitmap(text, font_size)
+                if font_data:
+                    self._line_cache[line_key] = font_data
+                    while len(self._line_cache) > self._line_cache_cap:
+                        oldest_key = next(iter(self._line_cache))
+                        del self._line_cache[oldest_key]
+
+            if font_data:
+                self._render_bitmap(font_data, speed=scroll_speed) 
+                print(f"✅ '{text}' 顯示完成")
+            else:
+                print(f"❌ '{text}' 顯示失敗")
+                self.show_message("Font Error!", "Check API server", clear_after=2)
+            
+            time.sleep(delay_between_texts)
+        print("🎉 所有文字顯示完畢!")
+
+    # 新增 display_small_text 函數
+    def display_small_text(self, texts, delay_between_texts=1, half_size_multiplier=0.5, scroll_speed=0.08):
+        """
+        以比預設字體小一半的大小顯示中文文字。
+
+        Args:
+            texts (list or str): 一個包含多個字串的列表，或單一字串。
+            delay_between_texts (int, optional): 每則訊息之間的延遲秒數。預設為 1。
+            half_size_multiplier (float, optional): 縮小倍數。0.5 表示縮小一半。
+            scroll_speed (float, optional): 跑馬燈捲動速度。預設為 0.08。
+        """
+        smaller_font_size = max(1, int(self.default_font_size * half_size_multiplier))
+        print(f"INFO: 將使用字體大小: {smaller_font_size}")
+        self.display(texts, delay_between_texts=delay_between_texts, font_size=smaller_font_size, scroll_speed=scroll_speed)
+
+    def show_message(self, line1, line2="", font_size=1, clear_after=0):
+        """
+        在螢幕上顯示簡單的英文字串訊息。
+        Args:
+            line1 (str): 第一行文字。
+            line2 (str): 第二行文字 (可選)。
+            font_size (int): 字體大小 (1=8px高, 2=16px高)。 # 這裡的 font_size 是指 SSD1306 驅動本身的內建字體大小
+            clear_after (int): 顯示後幾秒自動清除。0為不清除。
+        """
+        self.oled.fill(0)
+        char_height = 8 * font_size
+        self.oled.text(line1, 0, 0)
+        if line2:
+            self.oled.text(line2, 0, char_height + 2)
+        self.oled.show()
+        if clear_after > 0:
+            time.sleep(clear_after)
+            self.clear()
+
+    def clear(self):
+        """ 清除螢幕。"""
+        self.oled.fill(0)
+        self.oled.show()
+
+    def deinit(self):
+        """ 釋放資源：關閉持久連線並清除螢幕。"""
+        self._close_sock()
+        self.clear()
\ No newline at end of file
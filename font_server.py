@@ -1,5 +1,6 @@
 from flask import Flask, request, jsonify
 from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache
 import os
 
 app = Flask(__name__)
@@ -8,19 +9,26 @@ app = Flask(__name__)
 FONT_PATH = 'NotoSansTC-Regular.ttf'
 FONT_SIZE = 24
 
+@lru_cache(maxsize=16)
+def _get_font(font_size):
+    """
+    載入並快取字型物件：ImageFont.truetype 每次都會重新解析 TTF
+    並重建 FreeType 內部表格，同一個 font_size 只需要做一次。
+    """
+    if os.path.exists(FONT_PATH):
+        return ImageFont.truetype(FONT_PATH, font_size)
+    # 如果沒有指定字型，使用系統預設字型
+    print(f"警告: 找不到字型檔案 {FONT_PATH}, 使用預設字型")
+    return ImageFont.load_default()
+
 def text_to_bitmap(text, font_size=FONT_SIZE):
     """
     將文字轉換為點陣圖
     """
     try:
-        # 載入字型
-        if os.path.exists(FONT_PATH):
-            font = ImageFont.truetype(FONT_PATH, font_size)
-        else:
-            # 如果沒有指定字型，使用系統預設字型
-            font = ImageFont.load_default()
-            print(f"警告: 找不到字型檔案 {FONT_PATH}, 使用預設字型")
-        
+        # 載入字型（快取）
+        font = _get_font(font_size)
+
         # --- Modifying the logic for getting text dimensions and drawing ---
         # Create a dummy image to calculate text size accurately
         # Pillow's getbbox() can sometimes return (0,0,0,0) for empty strings